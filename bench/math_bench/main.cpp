@@ -0,0 +1,266 @@
+import std;
+
+import javelin.core.types;
+import javelin.math.mat4;
+import javelin.math.quat;
+import javelin.math.vec3;
+import javelin.math.vec4;
+
+// Throughput + accuracy harness for javelin.math.
+// Consumes the reference vectors written by tools/math_reference.py and reports ns/op and the
+// error of every result against the NumPy (f64, rounded once) answer.
+//
+//   python tools/math_reference.py --out-dir build/math_reference
+//   javelin_math_bench build/math_reference [--min-time 0.25] [--max-ulp N]
+//
+// Error is measured in ULPs of the largest-magnitude expected component of each result, so a
+// near-zero component produced by cancellation (cross products, rotations) is not reported as
+// millions of ULPs when the vector as a whole is accurate.
+
+using namespace javelin;
+
+namespace {
+
+constexpr std::array<char, 8> kMagic{'J', 'V', 'M', 'A', 'T', 'H', '\0', '\0'};
+constexpr u32 kVersion = 1;
+constexpr u32 kMaxOutFloats = 16;
+
+struct RefData final {
+    u32 count{};
+    u32 in_floats{};
+    u32 out_floats{};
+    std::vector<f32> inputs{};
+    std::vector<f32> expected{};
+};
+
+struct OpReport final {
+    std::string_view name{};
+    u32 count{};
+    f64 ns_per_op{};
+    f64 max_ulp{};
+    f64 mean_ulp{};
+    u32 worst_case{};
+};
+
+struct SlerpIn final {
+    Quat a{};
+    Quat b{};
+    f32 t{};
+};
+
+struct RotateIn final {
+    Quat q{};
+    Vec3 v{};
+};
+
+template <class T> [[nodiscard]] bool read_pod(std::ifstream &in, T &out) {
+    return static_cast<bool>(in.read(reinterpret_cast<char *>(&out), sizeof(T)));
+}
+
+[[nodiscard]] std::optional<RefData> load_ref(const std::filesystem::path &path, const u32 in_floats,
+                                              const u32 out_floats) {
+    std::ifstream in{path, std::ios::binary};
+    if (!in) {
+        std::println(std::cerr, "error: cannot open {}", path.string());
+        return std::nullopt;
+    }
+
+    std::array<char, 8> magic{};
+    u32 version = 0;
+    RefData ref{};
+    if (!read_pod(in, magic) || !read_pod(in, version) || !read_pod(in, ref.count) || !read_pod(in, ref.in_floats) ||
+        !read_pod(in, ref.out_floats)) {
+        std::println(std::cerr, "error: {} has a truncated header", path.string());
+        return std::nullopt;
+    }
+    if (magic != kMagic || version != kVersion) {
+        std::println(std::cerr, "error: {} is not a v{} math reference file", path.string(), kVersion);
+        return std::nullopt;
+    }
+    if (ref.in_floats != in_floats || ref.out_floats != out_floats) {
+        std::println(std::cerr, "error: {} layout is {}->{} floats, expected {}->{}", path.string(), ref.in_floats,
+                     ref.out_floats, in_floats, out_floats);
+        return std::nullopt;
+    }
+
+    ref.inputs.resize(usize{ref.count} * ref.in_floats);
+    ref.expected.resize(usize{ref.count} * ref.out_floats);
+    in.read(reinterpret_cast<char *>(ref.inputs.data()), static_cast<std::streamsize>(ref.inputs.size() * sizeof(f32)));
+    in.read(reinterpret_cast<char *>(ref.expected.data()),
+            static_cast<std::streamsize>(ref.expected.size() * sizeof(f32)));
+    if (!in) {
+        std::println(std::cerr, "error: {} is truncated", path.string());
+        return std::nullopt;
+    }
+    return ref;
+}
+
+[[nodiscard]] Mat4 load_mat4(const f32 *p) noexcept {
+    return Mat4::from_columns(Vec4{p[0], p[1], p[2], p[3]}, Vec4{p[4], p[5], p[6], p[7]},
+                              Vec4{p[8], p[9], p[10], p[11]}, Vec4{p[12], p[13], p[14], p[15]});
+}
+
+[[nodiscard]] Quat load_quat(const f32 *p) noexcept { return Quat{p[0], p[1], p[2], p[3]}; }
+
+[[nodiscard]] Vec3 load_vec3(const f32 *p) noexcept { return Vec3{p[0], p[1], p[2]}; }
+
+void store(const Mat4 &m, f32 *out) noexcept { std::copy_n(m.data(), 16, out); }
+void store(const Quat q, f32 *out) noexcept { std::copy_n(q.data(), 4, out); }
+void store(const Vec3 v, f32 *out) noexcept { std::copy_n(v.data(), 3, out); }
+
+// ULPs between `actual` and `expected`, in units of the f32 spacing at `scale`.
+[[nodiscard]] f64 ulp_error(const f32 actual, const f32 expected, const f32 scale) noexcept {
+    if (!std::isfinite(actual)) {
+        return std::numeric_limits<f64>::infinity();
+    }
+    const f32 spacing = std::max(std::nextafter(scale, std::numeric_limits<f32>::infinity()) - scale,
+                                 std::numeric_limits<f32>::denorm_min());
+    return std::fabs(static_cast<f64>(actual) - static_cast<f64>(expected)) / static_cast<f64>(spacing);
+}
+
+template <class In, class Decode, class Op>
+[[nodiscard]] OpReport run_op(const std::string_view name, const RefData &ref, Decode decode, Op op,
+                              const f64 min_seconds) {
+    using Out = std::invoke_result_t<Op &, const In &>;
+    using clock = std::chrono::steady_clock;
+
+    std::vector<In> inputs;
+    inputs.reserve(ref.count);
+    for (u32 i = 0; i < ref.count; ++i) {
+        inputs.push_back(decode(ref.inputs.data() + usize{i} * ref.in_floats));
+    }
+    std::vector<Out> outputs(ref.count);
+
+    // Warm-up pass; also the results that get checked.
+    for (u32 i = 0; i < ref.count; ++i) {
+        outputs[i] = op(inputs[i]);
+    }
+
+    usize reps = 0;
+    const auto t0 = clock::now();
+    auto elapsed = clock::duration{};
+    do {
+        for (u32 i = 0; i < ref.count; ++i) {
+            outputs[i] = op(inputs[i]);
+        }
+        ++reps;
+        elapsed = clock::now() - t0;
+    } while (std::chrono::duration<f64>(elapsed).count() < min_seconds);
+
+    OpReport report{.name = name, .count = ref.count};
+    report.ns_per_op = static_cast<f64>(std::chrono::duration_cast<std::chrono::nanoseconds>(elapsed).count()) /
+                       static_cast<f64>(reps * ref.count);
+
+    f64 ulp_sum = 0.0;
+    std::array<f32, kMaxOutFloats> actual{};
+    for (u32 i = 0; i < ref.count; ++i) {
+        store(outputs[i], actual.data());
+        const f32 *expected = ref.expected.data() + usize{i} * ref.out_floats;
+
+        f32 scale = 0.0f;
+        for (u32 k = 0; k < ref.out_floats; ++k) {
+            scale = std::max(scale, std::fabs(expected[k]));
+        }
+
+        f64 case_ulp = 0.0;
+        for (u32 k = 0; k < ref.out_floats; ++k) {
+            case_ulp = std::max(case_ulp, ulp_error(actual[k], expected[k], scale));
+        }
+        ulp_sum += case_ulp;
+        if (case_ulp > report.max_ulp) {
+            report.max_ulp = case_ulp;
+            report.worst_case = i;
+        }
+    }
+    report.mean_ulp = ref.count > 0 ? ulp_sum / static_cast<f64>(ref.count) : 0.0;
+    return report;
+}
+
+struct Options final {
+    std::filesystem::path dir{};
+    f64 min_seconds{0.25};
+    std::optional<f64> max_ulp{};
+};
+
+[[nodiscard]] std::optional<Options> parse_args(const std::span<char *const> args) {
+    Options opts{};
+    for (usize i = 1; i < args.size(); ++i) {
+        const std::string_view arg{args[i]};
+        if ((arg == "--min-time" || arg == "--max-ulp") && i + 1 < args.size()) {
+            const char *value = args[++i];
+            char *end = nullptr;
+            const f64 parsed = std::strtod(value, &end);
+            if (end == value || *end != '\0') {
+                std::println(std::cerr, "error: {} expects a number, got '{}'", arg, value);
+                return std::nullopt;
+            }
+            if (arg == "--min-time") {
+                opts.min_seconds = parsed;
+            } else {
+                opts.max_ulp = parsed;
+            }
+        } else if (!arg.starts_with("--") && opts.dir.empty()) {
+            opts.dir = arg;
+        } else {
+            std::println(std::cerr, "usage: {} <reference-dir> [--min-time seconds] [--max-ulp N]", args[0]);
+            return std::nullopt;
+        }
+    }
+    if (opts.dir.empty()) {
+        std::println(std::cerr, "usage: {} <reference-dir> [--min-time seconds] [--max-ulp N]", args[0]);
+        return std::nullopt;
+    }
+    return opts;
+}
+
+} // namespace
+
+int main(const int argc, char **argv) {
+    const auto opts = parse_args(std::span<char *const>{argv, static_cast<usize>(argc)});
+    if (!opts) {
+        return 2;
+    }
+
+    std::vector<OpReport> reports;
+    bool ok = true;
+
+    auto bench = [&]<class In>(const std::string_view name, const u32 in_floats, const u32 out_floats, auto decode,
+                               auto op) {
+        const auto ref = load_ref(opts->dir / std::format("{}.bin", name), in_floats, out_floats);
+        if (!ref) {
+            ok = false;
+            return;
+        }
+        reports.push_back(run_op<In>(name, *ref, decode, op, opts->min_seconds));
+    };
+
+    bench.operator()<std::pair<Mat4, Mat4>>(
+        "mat4_mul", 32, 16, [](const f32 *p) { return std::pair{load_mat4(p), load_mat4(p + 16)}; },
+        [](const std::pair<Mat4, Mat4> &in) { return in.first * in.second; });
+    bench.operator()<Mat4>("mat4_inverse", 16, 16, load_mat4, [](const Mat4 &m) { return inverse_or_identity(m); });
+    bench.operator()<SlerpIn>(
+        "quat_slerp", 9, 4, [](const f32 *p) { return SlerpIn{load_quat(p), load_quat(p + 4), p[8]}; },
+        [](const SlerpIn &in) { return slerp(in.a, in.b, in.t); });
+    bench.operator()<RotateIn>(
+        "quat_rotate", 7, 3, [](const f32 *p) { return RotateIn{load_quat(p), load_vec3(p + 4)}; },
+        [](const RotateIn &in) { return rotate(in.q, in.v); });
+    bench.operator()<Vec3>("vec3_normalize", 3, 3, load_vec3, [](const Vec3 &v) { return v.normalized_or_zero(); });
+    bench.operator()<std::pair<Vec3, Vec3>>(
+        "vec3_cross", 6, 3, [](const f32 *p) { return std::pair{load_vec3(p), load_vec3(p + 3)}; },
+        [](const std::pair<Vec3, Vec3> &in) { return cross(in.first, in.second); });
+
+    std::println("{:<16} {:>10} {:>10} {:>12} {:>10} {:>12}", "op", "cases", "ns/op", "max ulp", "mean ulp",
+                 "worst case");
+    for (const OpReport &r : reports) {
+        std::println("{:<16} {:>10} {:>10.3f} {:>12.2f} {:>10.3f} {:>12}", r.name, r.count, r.ns_per_op, r.max_ulp,
+                     r.mean_ulp, r.worst_case);
+        if (opts->max_ulp && r.max_ulp > *opts->max_ulp) {
+            ok = false;
+        }
+    }
+    if (opts->max_ulp && !ok) {
+        std::println(std::cerr, "error: max ulp error above {}", *opts->max_ulp);
+    }
+
+    return ok ? 0 : 1;
+}
@@ -23,6 +23,13 @@ struct App final {
         tracy::SetThreadName("Main");
         ZoneScoped;
 
+        // Opt-in low-overhead logging: JAVELIN_LOG_FILE=<path> records binary logs for tools/decode_log.py.
+        if (const char *log_file = std::getenv("JAVELIN_LOG_FILE"); log_file != nullptr && *log_file != '\0') {
+            if (!log::start_deferred(log_file)) {
+                log::warn(app, "Could not open deferred log file {}", log_file);
+            }
+        }
+
         log::info(app, "Start scene={}", scene_path.string());
 
         platform.init();
@@ -61,6 +68,7 @@ struct App final {
         platform.shutdown();
 
         log::info(app, "Shutting down app");
+        log::stop_deferred();
     }
 };
 
@@ -0,0 +1,342 @@
+export module javelin.core.log_buffer;
+
+import std;
+import javelin.core.types;
+
+// Deferred (binary) log backend.
+//
+// Producers never format: each call interns its format string to a small ID, encodes the raw
+// arguments into a per-thread SPSC byte ring and returns. A background writer drains every ring
+// into a compact binary file that tools/decode_log.py turns back into the usual text lines.
+//
+// File layout (native little-endian):
+//   header  : magic "JVLNLOG\0" | u32 version | u32 endian marker 0x01020304
+//   records : u8 kind, followed by
+//     kind_format  : u32 id | u32 len | utf-8 format string
+//     kind_message : u32 fmt id | u8 level | u8 tag | u16 thread | u64 ns since start | u32 len | args
+//     kind_dropped : u16 thread | u64 count (ring was full, messages lost)
+//     kind_level   : u8 value | u8 len | name
+//     kind_tag     : u8 value | u8 len | name
+//   args    : u8 arg kind, followed by its raw value (strings: u32 len | bytes)
+
+export namespace javelin::log::deferred {
+
+inline constexpr std::array<char, 8> kMagic{'J', 'V', 'L', 'N', 'L', 'O', 'G', '\0'};
+inline constexpr u32 kVersion = 1;
+inline constexpr u32 kEndianMarker = 0x01020304u;
+
+inline constexpr usize kRingCapacity = usize{1} << 16; // bytes per producer thread
+inline constexpr usize kMaxStringArg = 4096;
+
+enum class RecordKind : u8 { format = 1, message = 2, dropped = 3, level = 4, tag = 5 };
+
+enum class ArgKind : u8 { i64 = 1, u64 = 2, f32 = 3, f64 = 4, boolean = 5, character = 6, string = 7, pointer = 8 };
+
+namespace detail {
+
+// Single-producer (owning thread) / single-consumer (writer thread) byte ring.
+// Records are published whole, so the consumer never observes a partial record.
+struct Ring final {
+    explicit Ring(const u16 index) noexcept : thread_index{index} {}
+
+    [[nodiscard]] bool push(const std::span<const std::byte> bytes) noexcept {
+        const u64 head = head_.load(std::memory_order_relaxed);
+        const u64 tail = tail_.load(std::memory_order_acquire);
+        if (bytes.size() > kRingCapacity - static_cast<usize>(head - tail)) {
+            dropped.fetch_add(1, std::memory_order_relaxed);
+            return false;
+        }
+
+        const usize at = static_cast<usize>(head) & (kRingCapacity - 1);
+        const usize first = std::min(bytes.size(), kRingCapacity - at);
+        std::memcpy(data_.data() + at, bytes.data(), first);
+        std::memcpy(data_.data(), bytes.data() + first, bytes.size() - first);
+
+        head_.store(head + bytes.size(), std::memory_order_release);
+        return true;
+    }
+
+    // Appends everything published so far to `out`. Consumer thread only.
+    void drain_into(std::vector<std::byte> &out) {
+        const u64 tail = tail_.load(std::memory_order_relaxed);
+        const u64 head = head_.load(std::memory_order_acquire);
+        const usize size = static_cast<usize>(head - tail);
+        if (size == 0) {
+            return;
+        }
+
+        const usize at = static_cast<usize>(tail) & (kRingCapacity - 1);
+        const usize first = std::min(size, kRingCapacity - at);
+        out.insert(out.end(), data_.begin() + static_cast<isize>(at), data_.begin() + static_cast<isize>(at + first));
+        out.insert(out.end(), data_.begin(), data_.begin() + static_cast<isize>(size - first));
+
+        tail_.store(head, std::memory_order_release);
+    }
+
+    // Forgets everything published so far, including the drop count. Consumer side only.
+    void discard() noexcept {
+        tail_.store(head_.load(std::memory_order_acquire), std::memory_order_release);
+        dropped.store(0, std::memory_order_relaxed);
+    }
+
+    const u16 thread_index;
+    std::atomic<u64> dropped{0};
+
+  private:
+    alignas(64) std::atomic<u64> head_{0};
+    alignas(64) std::atomic<u64> tail_{0};
+    std::array<std::byte, kRingCapacity> data_{};
+};
+
+template <class T> void put(std::vector<std::byte> &out, const T &value) {
+    static_assert(std::is_trivially_copyable_v<T>);
+    const auto *p = reinterpret_cast<const std::byte *>(&value);
+    out.insert(out.end(), p, p + sizeof(T));
+}
+
+inline void put_bytes(std::vector<std::byte> &out, const std::string_view s) {
+    const auto *p = reinterpret_cast<const std::byte *>(s.data());
+    out.insert(out.end(), p, p + s.size());
+}
+
+inline void put_string_arg(std::vector<std::byte> &out, std::string_view s) {
+    s = s.substr(0, kMaxStringArg);
+    put(out, ArgKind::string);
+    put(out, static_cast<u32>(s.size()));
+    put_bytes(out, s);
+}
+
+template <class T> void encode_arg(std::vector<std::byte> &out, const T &arg) {
+    using D = std::remove_cvref_t<T>;
+    if constexpr (std::is_same_v<D, bool>) {
+        put(out, ArgKind::boolean);
+        put(out, static_cast<u8>(arg ? 1 : 0));
+    } else if constexpr (std::is_same_v<D, char>) {
+        put(out, ArgKind::character);
+        put(out, arg);
+    } else if constexpr (std::is_integral_v<D> && std::is_signed_v<D>) {
+        put(out, ArgKind::i64);
+        put(out, static_cast<i64>(arg));
+    } else if constexpr (std::is_integral_v<D>) {
+        put(out, ArgKind::u64);
+        put(out, static_cast<u64>(arg));
+    } else if constexpr (std::is_same_v<D, float>) {
+        put(out, ArgKind::f32);
+        put(out, arg);
+    } else if constexpr (std::is_floating_point_v<D>) {
+        put(out, ArgKind::f64);
+        put(out, static_cast<f64>(arg));
+    } else if constexpr (std::is_same_v<std::decay_t<D>, const char *> || std::is_same_v<std::decay_t<D>, char *>) {
+        put_string_arg(out, arg ? std::string_view{arg} : std::string_view{"(null)"});
+    } else if constexpr (std::is_convertible_v<const D &, std::string_view>) {
+        put_string_arg(out, std::string_view{arg});
+    } else if constexpr (std::is_pointer_v<D> || std::is_null_pointer_v<D>) {
+        put(out, ArgKind::pointer);
+        put(out, static_cast<u64>(reinterpret_cast<uptr>(static_cast<const void *>(arg))));
+    } else {
+        // No raw encoding for this type; format it here so the decoder still sees its text.
+        put_string_arg(out, std::format("{}", arg));
+    }
+}
+
+struct State final {
+    std::atomic<bool> active{false};
+
+    std::mutex rings_mutex;
+    std::vector<std::shared_ptr<Ring>> rings;
+
+    std::mutex formats_mutex;
+    std::deque<std::string> formats;
+    std::unordered_map<std::string_view, u32> format_ids;
+
+    std::mutex writer_mutex;
+    std::ofstream file;
+    std::jthread writer;
+    usize formats_written{0};
+
+    ~State() { stop(); }
+
+    [[nodiscard]] u32 intern(const std::string_view fmt) {
+        const std::lock_guard lock{formats_mutex};
+        if (const auto it = format_ids.find(fmt); it != format_ids.end()) {
+            return it->second;
+        }
+        const u32 id = static_cast<u32>(formats.size());
+        const std::string &stored = formats.emplace_back(fmt);
+        format_ids.emplace(std::string_view{stored}, id);
+        return id;
+    }
+
+    [[nodiscard]] Ring &thread_ring() {
+        thread_local std::shared_ptr<Ring> ring = [this] {
+            const std::lock_guard lock{rings_mutex};
+            auto r = std::make_shared<Ring>(static_cast<u16>(rings.size()));
+            rings.push_back(r);
+            return r;
+        }();
+        return *ring;
+    }
+
+    // Writer thread (or stop()) only; callers hold writer_mutex.
+    // Rings are appended one after another, so a batch is grouped by thread rather than by time;
+    // decode_log.py merges records back into timestamp order.
+    void flush_locked() {
+        std::vector<std::byte> batch;
+        std::vector<std::pair<u16, u64>> dropped;
+        {
+            const std::lock_guard lock{rings_mutex};
+            for (const auto &ring : rings) {
+                ring->drain_into(batch);
+                if (const u64 n = ring->dropped.exchange(0, std::memory_order_relaxed); n != 0) {
+                    dropped.emplace_back(ring->thread_index, n);
+                }
+            }
+        }
+
+        // Every drained message interned its format before being pushed, so writing the
+        // definitions known *now* guarantees they precede their first use in the file.
+        std::vector<std::byte> header;
+        {
+            const std::lock_guard lock{formats_mutex};
+            for (; formats_written < formats.size(); ++formats_written) {
+                const std::string &fmt = formats[formats_written];
+                put(header, RecordKind::format);
+                put(header, static_cast<u32>(formats_written));
+                put(header, static_cast<u32>(fmt.size()));
+                put_bytes(header, fmt);
+            }
+        }
+        for (const auto &[thread, count] : dropped) {
+            put(header, RecordKind::dropped);
+            put(header, thread);
+            put(header, count);
+        }
+
+        if (header.empty() && batch.empty()) {
+            return;
+        }
+        file.write(reinterpret_cast<const char *>(header.data()), static_cast<std::streamsize>(header.size()));
+        file.write(reinterpret_cast<const char *>(batch.data()), static_cast<std::streamsize>(batch.size()));
+        file.flush();
+    }
+
+    [[nodiscard]] bool start(const std::filesystem::path &path, const std::span<const std::string_view> level_names,
+                             const std::span<const std::string_view> tag_names) {
+        const std::lock_guard lock{writer_mutex};
+        if (active.load(std::memory_order_acquire)) {
+            return false;
+        }
+
+        file.open(path, std::ios::binary | std::ios::trunc);
+        if (!file) {
+            return false;
+        }
+
+        std::vector<std::byte> header;
+        put(header, kMagic);
+        put(header, kVersion);
+        put(header, kEndianMarker);
+        for (usize i = 0; i < level_names.size(); ++i) {
+            put(header, RecordKind::level);
+            put(header, static_cast<u8>(i));
+            put(header, static_cast<u8>(level_names[i].size()));
+            put_bytes(header, level_names[i]);
+        }
+        for (usize i = 0; i < tag_names.size(); ++i) {
+            put(header, RecordKind::tag);
+            put(header, static_cast<u8>(i));
+            put(header, static_cast<u8>(tag_names[i].size()));
+            put_bytes(header, tag_names[i]);
+        }
+        file.write(reinterpret_cast<const char *>(header.data()), static_cast<std::streamsize>(header.size()));
+        formats_written = 0;
+
+        // A producer that passed active() just before the previous stop() can still have pushed
+        // after its final drain; those records belong to no session, so drop them here.
+        {
+            const std::lock_guard rings_lock{rings_mutex};
+            for (const auto &ring : rings) {
+                ring->discard();
+            }
+        }
+
+        active.store(true, std::memory_order_release);
+        writer = std::jthread([this](const std::stop_token &st) {
+            while (!st.stop_requested()) {
+                std::this_thread::sleep_for(std::chrono::milliseconds{2});
+                const std::lock_guard writer_lock{writer_mutex};
+                flush_locked();
+            }
+        });
+        return true;
+    }
+
+    void stop() noexcept {
+        if (!active.exchange(false, std::memory_order_acq_rel)) {
+            return;
+        }
+        writer.request_stop();
+        if (writer.joinable()) {
+            writer.join();
+        }
+
+        const std::lock_guard lock{writer_mutex};
+        try {
+            flush_locked();
+        } catch (...) {
+            // Shutdown path; nothing useful to report to.
+        }
+        file.close();
+    }
+};
+
+[[nodiscard]] inline State &state() noexcept {
+    static State s{};
+    return s;
+}
+
+} // namespace detail
+
+[[nodiscard]] inline bool active() noexcept { return detail::state().active.load(std::memory_order_relaxed); }
+
+[[nodiscard]] inline bool start(const std::filesystem::path &path, const std::span<const std::string_view> level_names,
+                                const std::span<const std::string_view> tag_names) {
+    return detail::state().start(path, level_names, tag_names);
+}
+
+inline void stop() noexcept { detail::state().stop(); }
+
+template <class... Args>
+void record(const std::string_view fmt, const u8 level, const u8 tag, const u64 ns_since_start, const Args &...args) {
+    detail::State &s = detail::state();
+
+    thread_local std::unordered_map<const char *, u32> cached_ids;
+    u32 id = 0;
+    if (const auto it = cached_ids.find(fmt.data()); it != cached_ids.end()) {
+        id = it->second;
+    } else {
+        id = s.intern(fmt);
+        cached_ids.emplace(fmt.data(), id);
+    }
+
+    detail::Ring &ring = s.thread_ring();
+
+    thread_local std::vector<std::byte> scratch;
+    scratch.clear();
+    detail::put(scratch, RecordKind::message);
+    detail::put(scratch, id);
+    detail::put(scratch, level);
+    detail::put(scratch, tag);
+    detail::put(scratch, ring.thread_index);
+    detail::put(scratch, ns_since_start);
+    const usize len_at = scratch.size();
+    detail::put(scratch, u32{0});
+    (detail::encode_arg(scratch, args), ...);
+
+    const u32 len = static_cast<u32>(scratch.size() - len_at - sizeof(u32));
+    std::memcpy(scratch.data() + len_at, &len, sizeof(len));
+
+    (void)ring.push(scratch);
+}
+
+} // namespace javelin::log::deferred
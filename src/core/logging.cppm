@@ -7,6 +7,7 @@ module;
 export module javelin.core.logging;
 
 import std;
+import javelin.core.log_buffer;
 import javelin.core.types;
 
 export namespace javelin::log {
@@ -98,6 +99,21 @@ inline std::atomic<Sink> g_sink{&default_sink};
     return std::string_view{tag.data(), kTagWidth};
 }
 
+[[nodiscard]] inline u64 ns_since_start() noexcept {
+    return static_cast<u64>(
+        std::chrono::duration_cast<std::chrono::nanoseconds>(clock::now() - start_time()).count());
+}
+
+inline constexpr std::array<std::string_view, 7> kLevelNames{
+    to_string(Level::trace), to_string(Level::debug),    to_string(Level::info), to_string(Level::warn),
+    to_string(Level::error), to_string(Level::critical), to_string(Level::off),
+};
+
+inline constexpr std::array<std::string_view, 7> kTagNames{
+    to_string(Tag::app),     to_string(Tag::platform), to_string(Tag::scene), to_string(Tag::render),
+    to_string(Tag::physics), to_string(Tag::input),    to_string(Tag::none),
+};
+
 inline void tracy_message(const Level lvl, std::string_view s) noexcept {
 #if defined(TRACY_ENABLE)
     TracyMessage(s.data(), s.size());
@@ -112,10 +128,27 @@ inline void set_sink(const Sink s) noexcept {
     detail::g_sink.store(s ? s : &detail::default_sink, std::memory_order_release);
 }
 
+// Deferred mode: calls record the format-string ID and raw arguments into a per-thread ring and a
+// background thread writes them to `path` in binary. Decode with tools/decode_log.py. Formatting,
+// the sink and Tracy messages are skipped while deferred mode is active, except for error and critical
+// messages, which are also formatted and sent to the sink so fatal failures stay visible on stderr.
+[[nodiscard]] inline bool start_deferred(const std::filesystem::path &path) {
+    return deferred::start(path, detail::kLevelNames, detail::kTagNames);
+}
+
+inline void stop_deferred() noexcept { deferred::stop(); }
+
 template <Level level, class... Args> void log(std::format_string<Args...> fmt, Args &&...args) {
     if constexpr (level < compile_time_level)
         return;
 
+    if (deferred::active()) {
+        deferred::record(fmt.get(), static_cast<u8>(level), static_cast<u8>(Tag::none), detail::ns_since_start(),
+                         args...);
+        if constexpr (level < Level::error)
+            return;
+    }
+
     const auto ms =
         std::chrono::duration_cast<std::chrono::milliseconds>(detail::clock::now() - detail::start_time()).count();
 
@@ -135,6 +168,12 @@ template <Level level, class... Args> void log(const Tag tag, std::format_string
     if constexpr (level < compile_time_level)
         return;
 
+    if (deferred::active()) {
+        deferred::record(fmt.get(), static_cast<u8>(level), static_cast<u8>(tag), detail::ns_since_start(), args...);
+        if constexpr (level < Level::error)
+            return;
+    }
+
     const auto ms =
         std::chrono::duration_cast<std::chrono::milliseconds>(detail::clock::now() - detail::start_time()).count();
 
@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import re
+import tempfile
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Iterable, Iterator, Literal, NamedTuple, cast
@@ -27,6 +30,7 @@ class TextureInfo2D:
     dimensions: str
     interpolation: str
     npy_file: str
+    content_hash: str
     suggested_gl_target: Literal["GL_TEXTURE_1D", "GL_TEXTURE_2D"]
 
 
@@ -37,6 +41,7 @@ class TextureInfo3D:
     edge_len: int
     interpolation: str
     npy_file: str
+    content_hash: str
     suggested_gl_target: Literal["GL_TEXTURE_3D"] = "GL_TEXTURE_3D"
 
 
@@ -203,9 +208,61 @@ def _infer_gl_target_for_2d(tex: OCIO.GpuShaderDesc.Texture) -> Literal["GL_TEXT
     return "GL_TEXTURE_1D" if "TEXTURE_1D" in dims else "GL_TEXTURE_2D"
 
 
+def _content_hash(values: np.ndarray, layout: dict[str, Any]) -> str:
+    # The GPU layout (size, channel, dimensions, interpolation) is part of the key alongside the
+    # bytes: OCIO hands back a flat buffer, so identical bytes can be a RED 1D table in one view and
+    # an RGB or 2D table in another. Equal hashes therefore mean an identical texture, not just data.
+    h = hashlib.sha256()
+    h.update(json.dumps(layout, sort_keys=True).encode("utf-8"))
+    h.update(f"{values.dtype.str}{values.shape}".encode("ascii"))
+    h.update(np.ascontiguousarray(values).tobytes())
+    return h.hexdigest()
+
+
+def _umask() -> int:
+    # The umask can only be read by setting it.
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _save_texture(
+    values: np.ndarray,
+    layout: dict[str, Any],
+    out_dir: Path,
+    local_name: str,
+    pool_dir: Path | None,
+) -> tuple[str, str]:
+    """
+    Writes one LUT and returns (npy_file relative to out_dir, content hash).
+    With a pool, textures are stored once under their hash and shared by every manifest that uses them.
+    """
+    digest = _content_hash(values, layout)
+    if pool_dir is None:
+        np.save(out_dir / local_name, values)
+        return local_name, digest
+
+    pooled = pool_dir / f"{digest[:16]}.npy"
+    if not pooled.is_file():
+        # Several per-view runs may share a pool; publish atomically so a killed or concurrent
+        # run never leaves a truncated table under the final name.
+        fd, tmp_name = tempfile.mkstemp(dir=pool_dir, prefix=f".{digest[:16]}.", suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, values)
+            # mkstemp creates the file 0600; give it the umask-derived mode np.save would.
+            os.chmod(tmp_name, 0o666 & ~_umask())
+            os.replace(tmp_name, pooled)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    return Path(os.path.relpath(pooled, out_dir)).as_posix(), digest
+
+
 def _export_textures(
     shader_desc: OCIO.GpuShaderDesc,
     out_dir: Path,
+    pool_dir: Path | None = None,
 ) -> tuple[list[TextureInfo2D], list[TextureInfo3D]]:
     tex2d_infos: list[TextureInfo2D] = []
     tex3d_infos: list[TextureInfo3D] = []
@@ -222,8 +279,10 @@ def _export_textures(
 
         values = np.asarray(tex.getValues(), dtype=np.float32)  # :contentReference[oaicite:11]{index=11}
         # OCIO returns LUT data "as-is" for GPU upload. :contentReference[oaicite:12]{index=12}
-        npy_file = f"tex2d_{i}_{_safe_name(tex_name)}.npy"
-        np.save(out_dir / npy_file, values)
+        layout = {"width": w, "height": h, "channel": channel, "dimensions": dims, "interpolation": interp}
+        npy_file, digest = _save_texture(
+            values, layout, out_dir, f"tex2d_{i}_{_safe_name(tex_name)}.npy", pool_dir
+        )
 
         tex2d_infos.append(
             TextureInfo2D(
@@ -235,6 +294,7 @@ def _export_textures(
                 dimensions=dims,
                 interpolation=interp,
                 npy_file=npy_file,
+                content_hash=digest,
                 suggested_gl_target=_infer_gl_target_for_2d(tex),
             )
         )
@@ -249,8 +309,10 @@ def _export_textures(
             interp = str(tex3.interpolation)
 
             values = np.asarray(tex3.getValues(), dtype=np.float32)  # :contentReference[oaicite:14]{index=14}
-            npy_file = f"tex3d_{i}_{_safe_name(tex_name)}.npy"
-            np.save(out_dir / npy_file, values)
+            layout = {"edge_len": edge, "interpolation": interp}
+            npy_file, digest = _save_texture(
+                values, layout, out_dir, f"tex3d_{i}_{_safe_name(tex_name)}.npy", pool_dir
+            )
 
             tex3d_infos.append(
                 TextureInfo3D(
@@ -259,6 +321,7 @@ def _export_textures(
                     edge_len=edge,
                     interpolation=interp,
                     npy_file=npy_file,
+                    content_hash=digest,
                 )
             )
 
@@ -307,12 +370,21 @@ def main(argv: list[str] | None = None) -> int:
     ap.add_argument("--view", default=None, help="View name (optional).")
     ap.add_argument("--src", default=OCIO.ROLE_SCENE_LINEAR, help="Source colorspace/role. Default: ROLE_SCENE_LINEAR")
     ap.add_argument("--out-dir", default="ocio_out", help="Output directory.")
+    ap.add_argument(
+        "--pool-dir",
+        default=None,
+        help="Shared LUT pool. Textures are stored once by content+layout hash and referenced from the manifest; "
+        "point every view's run at the same pool to deduplicate across views.",
+    )
     ap.add_argument("--function-name", default="OCIODisplay", help="Name for the generated OCIO GLSL function.")
     ap.add_argument("--resource-prefix", default="ocio_", help="Prefix for generated resources to avoid collisions.")
     args = ap.parse_args(argv)
 
     out_dir = Path(args.out_dir)
     _ensure_dir(out_dir)
+    pool_dir = Path(args.pool_dir) if args.pool_dir else None
+    if pool_dir is not None:
+        _ensure_dir(pool_dir)
 
     config = _load_config(str(args.config))
     dv = _pick_display_view(config, args.display, args.view)
@@ -339,7 +411,7 @@ def main(argv: list[str] | None = None) -> int:
     _write_text(out_dir / "ocio_shader.glsl", shader_text)
     _write_text(out_dir / "example_fullscreen.frag", _wrap_fullscreen_fragment(shader_text, str(args.function_name)))
 
-    tex2d_infos, tex3d_infos = _export_textures(shader_desc, out_dir)
+    tex2d_infos, tex3d_infos = _export_textures(shader_desc, out_dir, pool_dir)
 
     uniforms = _serialize_uniforms(shader_desc)
     ubo_size = int(shader_desc.getUniformBufferSize())  # :contentReference[oaicite:19]{index=19}
@@ -368,6 +440,9 @@ def main(argv: list[str] | None = None) -> int:
     print(f"Wrote: {out_dir/'example_fullscreen.frag'}")
     print(f"Wrote: {out_dir/'manifest.json'}")
     print(f"Textures: {len(tex2d_infos)} (1D/2D), {len(tex3d_infos)} (3D)")
+    if pool_dir is not None:
+        unique = {t.content_hash for t in tex2d_infos} | {t.content_hash for t in tex3d_infos}
+        print(f"LUT pool: {pool_dir} ({len(unique)} unique table(s) referenced)")
     print(f"Selected display/view: {dv.display!r} / {dv.view!r}")
     return 0
 
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import profile_build as pb
+
+# Benchmarks for the Python tooling on synthetic, deliberately oversized inputs:
+# million-step .ninja_log files for profile_build.py and large LUTs for
+# aces_transform_generator.py. The pre-columnar implementations are kept below as
+# the "legacy" baseline so every run shows what the current code actually buys.
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchResult:
+    name: str
+    seconds: float
+    peak_mb: float | None
+
+
+# Includes edge cases the fast extension parser must agree with Path on (case, trailing "/", dotfiles).
+_SUFFIXES = (".o", ".pcm", ".cppm.o", ".cpp.o", ".a", ".ddi", ".modmap", "", ".O", ".o/", "/.hidden", ".")
+
+
+def _write_synthetic_ninja_log(path: Path, n: int, seed: int) -> None:
+    rng = random.Random(seed)
+    t = 0
+    with path.open("w", encoding="utf-8") as f:
+        f.write("# ninja log v6\n")
+        chunk: list[str] = []
+        for i in range(n):
+            start = t + rng.randrange(0, 50)
+            end = start + rng.randrange(1, 5000)
+            t = start
+            suffix = _SUFFIXES[i % len(_SUFFIXES)]
+            output = f"src/CMakeFiles/javelin.dir/mod_{i % 997}/unit_{i}{suffix}"
+            chunk.append(f"{start}\t{end}\t0\t{output}\t{rng.getrandbits(64):016x}\n")
+            if len(chunk) >= 8192:
+                f.write("".join(chunk))
+                chunk.clear()
+        f.write("".join(chunk))
+
+
+def _legacy_read_ninja_log(path: Path) -> list[pb.NinjaLogEntry]:
+    entries: list[pb.NinjaLogEntry] = []
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split("\t")
+            if len(parts) < 4:
+                continue
+            try:
+                start_ms = int(parts[0])
+                end_ms = int(parts[1])
+            except ValueError:
+                continue
+            entries.append(pb.NinjaLogEntry(start_ms=start_ms, end_ms=end_ms, output=parts[3]))
+    return entries
+
+
+def _legacy_summarize_by_ext(entries: Sequence[pb.NinjaLogEntry]) -> list[tuple[str, int, float, float]]:
+    buckets: dict[str, list[int]] = defaultdict(list)
+    for e in entries:
+        ext = Path(e.output).suffix.lower()
+        buckets[ext if ext else "<none>"].append(e.dur_ms)
+
+    rows: list[tuple[str, int, float, float]] = []
+    for ext, durs in buckets.items():
+        total_s = sum(durs) / 1000.0
+        rows.append((ext, len(durs), total_s, total_s / len(durs)))
+    rows.sort(key=lambda r: r[2], reverse=True)
+    return rows
+
+
+def _legacy_write_trace_json(entries: Sequence[pb.NinjaLogEntry], out_path: Path) -> None:
+    events: list[dict[str, object]] = [
+        {"ph": "M", "pid": 1, "tid": 1, "name": "process_name", "args": {"name": "ninja"}},
+        {"ph": "M", "pid": 1, "tid": 1, "name": "thread_name", "args": {"name": "build"}},
+    ]
+    for e in entries:
+        events.append(
+            {"name": e.output, "cat": "ninja", "ph": "X", "ts": e.start_ms * 1000, "dur": e.dur_ms * 1000,
+             "pid": 1, "tid": 1}
+        )
+    out_path.write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
+
+
+def _measure(name: str, fn: Callable[[], Any], *, memory: bool) -> tuple[BenchResult, Any]:
+    if memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - t0
+    peak_mb: float | None = None
+    if memory:
+        peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return BenchResult(name=name, seconds=seconds, peak_mb=peak_mb), result
+
+
+def _bench_ninja(work: Path, n: int, seed: int, memory: bool, legacy: bool) -> list[BenchResult]:
+    log_path = work / ".ninja_log"
+    _write_synthetic_ninja_log(log_path, n, seed)
+
+    results: list[BenchResult] = []
+
+    r, log = _measure("_read_ninja_log", lambda: pb._read_ninja_log(log_path), memory=memory)
+    results.append(r)
+    r, rows = _measure("_summarize_by_ext", lambda: pb._summarize_by_ext(log), memory=memory)
+    results.append(r)
+    r, _ = _measure("_write_trace_json", lambda: pb._write_trace_json(log, work / "trace.json"), memory=memory)
+    results.append(r)
+    r, _ = _measure(
+        "_write_trace_json (.gz)", lambda: pb._write_trace_json(log, work / "trace.json.gz"), memory=memory
+    )
+    results.append(r)
+
+    if legacy:
+        r, entries = _measure("legacy _read_ninja_log", lambda: _legacy_read_ninja_log(log_path), memory=memory)
+        results.append(r)
+        r, legacy_rows = _measure(
+            "legacy _summarize_by_ext", lambda: _legacy_summarize_by_ext(entries), memory=memory
+        )
+        results.append(r)
+        r, _ = _measure(
+            "legacy _write_trace_json",
+            lambda: _legacy_write_trace_json(entries, work / "trace_legacy.json"),
+            memory=memory,
+        )
+        results.append(r)
+
+        # The rewrite must not change what users see.
+        if rows != legacy_rows:
+            raise RuntimeError("_summarize_by_ext disagrees with the legacy implementation")
+        if json.loads((work / "trace.json").read_text(encoding="utf-8")) != json.loads(
+            (work / "trace_legacy.json").read_text(encoding="utf-8")
+        ):
+            raise RuntimeError("_write_trace_json disagrees with the legacy implementation")
+
+    return results
+
+
+class _FakeTexture:
+    # Duck-types the attributes of OCIO.GpuShaderDesc.Texture read by _export_textures.
+    def __init__(self, name: str, values: Any, width: int, height: int, edge_len: int = 0) -> None:
+        self.textureName = name
+        self.samplerName = f"{name}Sampler"
+        self.width = width
+        self.height = height
+        self.edgeLen = edge_len
+        self.channel = "TextureType.TEXTURE_RGB_CHANNEL"
+        self.dimensions = "TextureDimensions.TEXTURE_2D"
+        self.interpolation = "Interpolation.INTERP_LINEAR"
+        self._values = values
+
+    def getValues(self) -> Any:
+        return self._values
+
+
+class _FakeShaderDesc:
+    def __init__(self, textures: list[_FakeTexture], textures_3d: list[_FakeTexture]) -> None:
+        self._textures = textures
+        self._textures_3d = textures_3d
+
+    def getTextures(self) -> list[_FakeTexture]:
+        return self._textures
+
+    def get3DTextures(self) -> list[_FakeTexture]:
+        return self._textures_3d
+
+
+def _bench_export_textures(work: Path, edge: int, seed: int, memory: bool) -> list[BenchResult]:
+    try:
+        import numpy as np
+
+        import aces_transform_generator as gen
+    except ImportError as e:
+        print(f"skipping _export_textures: {e}", file=sys.stderr)
+        return []
+
+    rng = np.random.default_rng(seed)
+    width = 4096
+    textures = [
+        _FakeTexture(f"ocio_lut1d_{i}", rng.random(width * 64 * 3, dtype=np.float32), width, 64) for i in range(4)
+    ]
+    textures_3d = [_FakeTexture("ocio_lut3d_0", rng.random(edge**3 * 3, dtype=np.float32), 0, 0, edge_len=edge)]
+    desc = _FakeShaderDesc(textures, textures_3d)
+
+    out_dir = work / "lut"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    r, _ = _measure("_export_textures", lambda: gen._export_textures(desc, out_dir), memory=memory)
+    return [r]
+
+
+def _print_results(results: Sequence[BenchResult]) -> None:
+    table: list[list[str]] = [["benchmark", "time(s)", "peak(MB)"]]
+    for r in results:
+        table.append([r.name, f"{r.seconds:.3f}", "-" if r.peak_mb is None else f"{r.peak_mb:.1f}"])
+    pb._print_table(table)
+
+
+def main(argv: Sequence[str]) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the Python tools on synthetic large inputs.")
+    ap.add_argument("--entries", type=int, default=1_000_000, help="Synthetic .ninja_log steps (default: 1e6).")
+    ap.add_argument("--lut-edge", type=int, default=65, help="Edge length of the synthetic 3D LUT (default: 65).")
+    ap.add_argument("--seed", type=int, default=1, help="RNG seed for synthetic inputs.")
+    ap.add_argument("--memory", action="store_true", help="Also report peak Python allocations (slower).")
+    ap.add_argument("--no-legacy", action="store_true", help="Skip the legacy baseline implementations.")
+    ap.add_argument("--work-dir", type=Path, default=None, help="Keep generated inputs/outputs here.")
+    args = ap.parse_args(list(argv))
+
+    with tempfile.TemporaryDirectory(prefix="javelin_bench_") as tmp:
+        work = args.work_dir or Path(tmp)
+        work.mkdir(parents=True, exist_ok=True)
+
+        print(f"== javelin tools benchmark ==")
+        print(f"ninja log steps : {args.entries}")
+        print(f"3D LUT edge     : {args.lut_edge}")
+        print(f"work dir        : {work}")
+        print()
+
+        results = _bench_ninja(work, args.entries, args.seed, args.memory, not args.no_legacy)
+        results += _bench_export_textures(work, args.lut_edge, args.seed, args.memory)
+        _print_results(results)
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main(sys.argv[1:]))
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        raise SystemExit(1)
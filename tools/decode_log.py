@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import decimal
+import heapq
+import re
+import struct
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import BinaryIO, Iterator, Sequence
+
+# Mirrors src/core/log_buffer.cppm.
+_MAGIC = b"JVLNLOG\0"
+_VERSION = 1
+_ENDIAN_MARKER = 0x01020304
+_TAG_WIDTH = 8
+
+_KIND_FORMAT = 1
+_KIND_MESSAGE = 2
+_KIND_DROPPED = 3
+_KIND_LEVEL = 4
+_KIND_TAG = 5
+
+_ARG_I64 = 1
+_ARG_U64 = 2
+_ARG_F32 = 3
+_ARG_F64 = 4
+_ARG_BOOL = 5
+_ARG_CHAR = 6
+_ARG_STRING = 7
+_ARG_POINTER = 8
+
+_HEADER = struct.Struct("<8sII")
+_FORMAT_HEAD = struct.Struct("<II")
+_MESSAGE_HEAD = struct.Struct("<IBBHQI")
+_DROPPED = struct.Struct("<HQ")
+_NAME_HEAD = struct.Struct("<BB")
+
+
+@dataclasses.dataclass(frozen=True)
+class LogMessage:
+    ts_ns: int
+    level: int
+    tag: int
+    thread: int
+    fmt: str
+    args: tuple[object, ...]
+
+    @property
+    def ms(self) -> int:
+        return self.ts_ns // 1_000_000
+
+
+@dataclasses.dataclass
+class LogFile:
+    levels: dict[int, str] = dataclasses.field(default_factory=dict)
+    tags: dict[int, str] = dataclasses.field(default_factory=dict)
+    formats: dict[int, str] = dataclasses.field(default_factory=dict)
+    dropped: dict[int, int] = dataclasses.field(default_factory=lambda: defaultdict(int))
+
+    def level_name(self, level: int) -> str:
+        return self.levels.get(level, f"L{level}")
+
+    def tag_name(self, tag: int) -> str:
+        return self.tags.get(tag, f"tag{tag}")
+
+
+_SPEC_RE = re.compile(r"^(?:(?P<fill>.)?(?P<align>[<>^]))?(?P<sign>[-+ ])?(?P<zero>0)?(?P<width>\d+)?$")
+
+
+def _format_number_text(text: str, spec: str) -> str:
+    # Pads an already-rendered number the way std::format does: right-aligned by default,
+    # with sign and zero-padding applied to the digits rather than to a string.
+    m = _SPEC_RE.match(spec)
+    if m is None:
+        return format(text, spec)
+    if m["sign"] in ("+", " ") and not text.startswith("-"):
+        text = m["sign"] + text
+    width = int(m["width"] or 0)
+    if m["align"]:
+        return format(text, f"{m['fill'] or ''}{m['align']}{width or ''}")
+    if m["zero"] and len(text) < width:
+        sign = text[0] if text[:1] in ("-", "+", " ") else ""
+        body = text[len(sign) :]
+        prefix = body[:2] if body[:2] in ("0x", "0X") else ""
+        return sign + prefix + body[len(prefix) :].rjust(width - len(sign) - len(prefix), "0")
+    return text.rjust(width)
+
+
+class _Bool:
+    # std::format prints bools as true/false unless given an integer presentation type.
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool) -> None:
+        self.value = value
+
+    def __format__(self, spec: str) -> str:
+        if spec and spec[-1] in "bBdoxX":
+            return format(int(self.value), spec)
+        return format("true" if self.value else "false", spec)
+
+
+class _Float:
+    # std::format's default float presentation is std::to_chars' shortest form: the shortest
+    # round-trip digits (at single precision for f32), written in fixed or d.ddde±XX notation,
+    # whichever is shorter, with fixed winning a tie.
+    __slots__ = ("value", "single")
+
+    def __init__(self, value: float, single: bool) -> None:
+        self.value = value
+        self.single = single
+
+    def _shortest(self) -> str:
+        if self.value != self.value or self.value in (float("inf"), float("-inf")):
+            return repr(self.value)
+        text = repr(self.value)
+        if self.single:
+            for digits in range(1, 10):
+                candidate = f"{self.value:.{digits}g}"
+                if struct.unpack("<f", struct.pack("<f", float(candidate)))[0] == self.value:
+                    text = candidate
+                    break
+
+        sign, digit_tuple, exponent = decimal.Decimal(text).as_tuple()
+        digits = "".join(map(str, digit_tuple)).lstrip("0")
+        stripped = digits.rstrip("0")
+        if not stripped:
+            return "-0" if sign else "0"
+        # Decimal point position relative to the start of `stripped`.
+        point = len(digits) + int(exponent)
+        if point >= len(stripped):
+            fixed = stripped + "0" * (point - len(stripped))
+        elif point > 0:
+            fixed = f"{stripped[:point]}.{stripped[point:]}"
+        else:
+            fixed = f"0.{'0' * -point}{stripped}"
+        mantissa = stripped[0] + (f".{stripped[1:]}" if len(stripped) > 1 else "")
+        scientific = f"{mantissa}e{point - 1:+03d}"
+        return ("-" if sign else "") + (fixed if len(fixed) <= len(scientific) else scientific)
+
+    def __format__(self, spec: str) -> str:
+        if spec and spec[-1] in "aAeEfFgG%":
+            return format(self.value, spec)
+        return _format_number_text(self._shortest(), spec)
+
+
+class _Pointer:
+    __slots__ = ("value",)
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def __format__(self, spec: str) -> str:
+        return _format_number_text(f"{self.value:#x}", spec)
+
+
+def _read_exact(f: BinaryIO, n: int) -> bytes:
+    data = f.read(n)
+    if len(data) != n:
+        raise EOFError
+    return data
+
+
+def _decode_args(payload: bytes) -> tuple[object, ...]:
+    args: list[object] = []
+    pos = 0
+    while pos < len(payload):
+        kind = payload[pos]
+        pos += 1
+        if kind == _ARG_I64:
+            args.append(struct.unpack_from("<q", payload, pos)[0])
+            pos += 8
+        elif kind == _ARG_U64:
+            args.append(struct.unpack_from("<Q", payload, pos)[0])
+            pos += 8
+        elif kind == _ARG_F32:
+            args.append(_Float(struct.unpack_from("<f", payload, pos)[0], single=True))
+            pos += 4
+        elif kind == _ARG_F64:
+            args.append(_Float(struct.unpack_from("<d", payload, pos)[0], single=False))
+            pos += 8
+        elif kind == _ARG_BOOL:
+            args.append(_Bool(payload[pos] != 0))
+            pos += 1
+        elif kind == _ARG_CHAR:
+            args.append(chr(payload[pos]))
+            pos += 1
+        elif kind == _ARG_STRING:
+            (n,) = struct.unpack_from("<I", payload, pos)
+            pos += 4
+            if pos + n > len(payload):
+                raise ValueError(f"string argument of {n} bytes overruns the payload")
+            args.append(payload[pos : pos + n].decode("utf-8", errors="replace"))
+            pos += n
+        elif kind == _ARG_POINTER:
+            args.append(_Pointer(struct.unpack_from("<Q", payload, pos)[0]))
+            pos += 8
+        else:
+            raise ValueError(f"unknown argument kind {kind}")
+    if pos != len(payload):
+        raise ValueError("last argument overruns the payload")
+    return tuple(args)
+
+
+def _iter_records(f: BinaryIO, log: LogFile) -> Iterator[LogMessage]:
+    try:
+        magic, version, endian = _HEADER.unpack(_read_exact(f, _HEADER.size))
+    except EOFError:
+        raise RuntimeError("not a javelin binary log (truncated header)") from None
+    if magic != _MAGIC:
+        raise RuntimeError("not a javelin binary log (bad magic)")
+    if endian != _ENDIAN_MARKER:
+        raise RuntimeError("log was written on a big-endian host; not supported")
+    if version != _VERSION:
+        raise RuntimeError(f"unsupported log version {version} (expected {_VERSION})")
+
+    while True:
+        kind_b = f.read(1)
+        if not kind_b:
+            return
+        kind = kind_b[0]
+        offset = f.tell() - 1
+        try:
+            if kind == _KIND_MESSAGE:
+                fmt_id, level, tag, thread, ts_ns, n = _MESSAGE_HEAD.unpack(_read_exact(f, _MESSAGE_HEAD.size))
+                payload = _read_exact(f, n)
+                # The record length is known, so a bad message is skipped rather than ending the decode.
+                fmt = log.formats.get(fmt_id)
+                if fmt is None:
+                    print(f"warning: skipping message at offset {offset}: unknown format id {fmt_id}", file=sys.stderr)
+                    continue
+                try:
+                    args = _decode_args(payload)
+                except (ValueError, IndexError, struct.error) as e:
+                    print(f"warning: skipping corrupt message at offset {offset}: {e}", file=sys.stderr)
+                    continue
+                yield LogMessage(ts_ns=ts_ns, level=level, tag=tag, thread=thread, fmt=fmt, args=args)
+            elif kind == _KIND_FORMAT:
+                fmt_id, n = _FORMAT_HEAD.unpack(_read_exact(f, _FORMAT_HEAD.size))
+                log.formats[fmt_id] = _read_exact(f, n).decode("utf-8", errors="replace")
+            elif kind == _KIND_DROPPED:
+                thread, count = _DROPPED.unpack(_read_exact(f, _DROPPED.size))
+                log.dropped[thread] += count
+            elif kind in (_KIND_LEVEL, _KIND_TAG):
+                value, n = _NAME_HEAD.unpack(_read_exact(f, _NAME_HEAD.size))
+                name = _read_exact(f, n).decode("utf-8", errors="replace")
+                (log.levels if kind == _KIND_LEVEL else log.tags)[value] = name
+            else:
+                raise RuntimeError(f"unknown record kind {kind} at offset {offset}")
+        except EOFError:
+            # The writer flushes whole batches, but a crash can still truncate the tail.
+            print(f"warning: log ends with a truncated record at offset {offset}", file=sys.stderr)
+            return
+        except struct.error as e:
+            raise RuntimeError(f"corrupt record at offset {offset}: {e}") from None
+
+
+_FIELD_RE = re.compile(r"\{\{|\}\}|\{([0-9]*)(?::((?:[^{}]|\{[0-9]*\})*))?\}")
+_NESTED_RE = re.compile(r"\{([0-9]*)\}")
+
+
+def format_message(fmt: str, args: Sequence[object]) -> str:
+    """Applies a std::format string to decoded arguments (subset used by the engine)."""
+    next_index = 0
+
+    def take(index: str) -> object:
+        nonlocal next_index
+        if index:
+            return args[int(index)]
+        value = args[next_index]
+        next_index += 1
+        return value
+
+    def field(m: re.Match[str]) -> str:
+        text = m.group(0)
+        if text == "{{":
+            return "{"
+        if text == "}}":
+            return "}"
+        value = take(m.group(1))
+        spec = _NESTED_RE.sub(lambda n: str(take(n.group(1))), m.group(2) or "")
+        return format(value, spec)
+
+    try:
+        return _FIELD_RE.sub(field, fmt)
+    except (IndexError, ValueError) as e:
+        return f"{fmt} <decode error: {e}; args={list(args)!r}>"
+
+
+def render_line(log: LogFile, msg: LogMessage) -> str:
+    tag = log.tag_name(msg.tag)[:_TAG_WIDTH]
+    return f"[{msg.ms:>6} ms] [{log.level_name(msg.level):^6}] [{tag:<{_TAG_WIDTH}}] {format_message(msg.fmt, msg.args)}"
+
+
+def _print_table(rows: Sequence[Sequence[str]]) -> None:
+    widths = [0] * max((len(r) for r in rows), default=0)
+    for r in rows:
+        for i, c in enumerate(r):
+            widths[i] = max(widths[i], len(c))
+    for r in rows:
+        line = "  ".join(c.ljust(widths[i]) for i, c in enumerate(r))
+        print(line)
+
+
+@dataclasses.dataclass
+class _TagStats:
+    count: int = 0
+    first_ns: int = 0
+    last_ns: int = 0
+    by_level: dict[int, int] = dataclasses.field(default_factory=lambda: defaultdict(int))
+    per_second: dict[int, int] = dataclasses.field(default_factory=lambda: defaultdict(int))
+
+
+def _print_stats(log: LogFile, messages: Iterator[LogMessage]) -> None:
+    stats: dict[int, _TagStats] = {}
+    for msg in messages:
+        s = stats.get(msg.tag)
+        if s is None:
+            s = stats[msg.tag] = _TagStats(first_ns=msg.ts_ns)
+        s.count += 1
+        s.first_ns = min(s.first_ns, msg.ts_ns)
+        s.last_ns = max(s.last_ns, msg.ts_ns)
+        s.by_level[msg.level] += 1
+        s.per_second[msg.ts_ns // 1_000_000_000] += 1
+
+    table: list[list[str]] = [["tag", "count", "span(s)", "avg/s", "peak/s", "levels"]]
+    for tag, s in sorted(stats.items(), key=lambda kv: kv[1].count, reverse=True):
+        span_s = (s.last_ns - s.first_ns) / 1e9
+        avg = s.count / span_s if span_s > 0 else float(s.count)
+        levels = " ".join(f"{log.level_name(lvl)}={n}" for lvl, n in sorted(s.by_level.items()))
+        table.append(
+            [
+                log.tag_name(tag) or "<none>",
+                str(s.count),
+                f"{span_s:.3f}",
+                f"{avg:.1f}",
+                str(max(s.per_second.values())),
+                levels,
+            ]
+        )
+    _print_table(table)
+
+
+def _level_value(log: LogFile, name: str) -> int:
+    for value, level_name in log.levels.items():
+        if level_name.casefold() == name.casefold():
+            return value
+    raise RuntimeError(f"unknown level '{name}'. Available: {sorted(log.levels.values())}")
+
+
+def _filtered(log: LogFile, messages: Iterator[LogMessage], args: argparse.Namespace) -> Iterator[LogMessage]:
+    tags = {t.casefold() for t in args.tag} if args.tag else None
+    threads = set(args.thread) if args.thread else None
+    grep = re.compile(args.grep) if args.grep else None
+    min_level: int | None = None
+
+    for msg in messages:
+        # Level names arrive in the file header, so resolve lazily.
+        if args.level is not None and min_level is None:
+            min_level = _level_value(log, args.level)
+        if min_level is not None and msg.level < min_level:
+            continue
+        if tags is not None and log.tag_name(msg.tag).casefold() not in tags:
+            continue
+        if threads is not None and msg.thread not in threads:
+            continue
+        if args.since is not None and msg.ms < args.since:
+            continue
+        if args.until is not None and msg.ms > args.until:
+            continue
+        if grep is not None and not grep.search(format_message(msg.fmt, msg.args)):
+            continue
+        yield msg
+
+
+def _chronological(messages: Iterator[LogMessage], window_ns: int) -> Iterator[LogMessage]:
+    # The writer appends each batch one thread ring at a time, so records from different threads
+    # arrive out of order, but never by more than about one batch. Holding back anything newer
+    # than `window_ns` behind the latest timestamp seen restores time order in bounded memory.
+    heap: list[tuple[int, int, LogMessage]] = []
+    latest = 0
+    for seq, msg in enumerate(messages):
+        heapq.heappush(heap, (msg.ts_ns, seq, msg))
+        latest = max(latest, msg.ts_ns)
+        while heap and heap[0][0] <= latest - window_ns:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def main(argv: Sequence[str]) -> int:
+    ap = argparse.ArgumentParser(description="Decode javelin deferred binary logs (JAVELIN_LOG_FILE) to text.")
+    ap.add_argument("log", type=Path, help="Binary log written by javelin::log::start_deferred.")
+    ap.add_argument("--level", default=None, help="Minimum level to show (e.g. INFO, WARN).")
+    ap.add_argument("--tag", action="append", default=[], help="Only show this tag (repeatable).")
+    ap.add_argument("--thread", type=int, action="append", default=[], help="Only show this writer thread index.")
+    ap.add_argument("--grep", default=None, help="Only show messages whose text matches this regex.")
+    ap.add_argument("--since", type=int, default=None, help="Only show messages at or after this time (ms).")
+    ap.add_argument("--until", type=int, default=None, help="Only show messages at or before this time (ms).")
+    ap.add_argument("--stats", action="store_true", help="Print per-tag rate statistics instead of messages.")
+    ap.add_argument(
+        "--reorder-window",
+        type=int,
+        default=250,
+        help="Sort messages by time within this many ms (default: 250; 0 keeps file order).",
+    )
+    args = ap.parse_args(list(argv))
+
+    if not args.log.is_file():
+        raise RuntimeError(f"{args.log} not found.")
+
+    log = LogFile()
+    with args.log.open("rb") as f:
+        messages = _filtered(log, _iter_records(f, log), args)
+        if args.stats:
+            _print_stats(log, messages)
+        else:
+            if args.reorder_window > 0:
+                messages = _chronological(messages, args.reorder_window * 1_000_000)
+            out = sys.stdout
+            for msg in messages:
+                out.write(render_line(log, msg))
+                out.write("\n")
+
+    for thread, count in sorted(log.dropped.items()):
+        print(f"warning: thread {thread} dropped {count} message(s) (ring full)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main(sys.argv[1:]))
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        raise SystemExit(1)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+
+# Reference vectors for bench/math_bench (javelin.math). One file per operation:
+#   header : magic "JVMATH\0\0" | u32 version | u32 count | u32 in_floats | u32 out_floats
+#   data   : count * in_floats f32 inputs, then count * out_floats f32 expected outputs
+# Inputs are drawn in f32; expected outputs are computed in f64 from those exact f32 inputs and
+# rounded once, so they are the best f32 answer the engine could produce. Matrices are column-major.
+
+_MAGIC = b"JVMATH\0\0"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIII")
+
+
+@dataclasses.dataclass(frozen=True)
+class Op:
+    name: str
+    in_floats: int
+    out_floats: int
+    make: Callable[[np.random.Generator, int], tuple[np.ndarray, np.ndarray]]
+
+
+def _f32(a: np.ndarray) -> np.ndarray:
+    # Quantize to what the engine will actually read, then continue in f64.
+    return a.astype(np.float32).astype(np.float64)
+
+
+def _unit_quats(rng: np.random.Generator, n: int) -> np.ndarray:
+    q = rng.standard_normal((n, 4))
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def _col_major(m: np.ndarray) -> np.ndarray:
+    # (n, row, col) -> (n, 16) with columns contiguous, matching Mat4::data().
+    return m.transpose(0, 2, 1).reshape(len(m), 16)
+
+
+def _from_col_major(flat: np.ndarray) -> np.ndarray:
+    return flat.reshape(len(flat), 4, 4).transpose(0, 2, 1)
+
+
+def _random_invertible_mat4(rng: np.random.Generator, n: int) -> np.ndarray:
+    # Half TRS transforms (what the renderer actually inverts), half well-conditioned general matrices.
+    half = n // 2
+    q = _unit_quats(rng, half)
+    x, y, z, w = q.T
+    rot = np.stack(
+        [
+            np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=1),
+            np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=1),
+            np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=1),
+        ],
+        axis=1,
+    )
+    trs = np.zeros((half, 4, 4))
+    trs[:, :3, :3] = rot * rng.uniform(0.25, 4.0, (half, 1, 3))
+    trs[:, :3, 3] = rng.uniform(-100.0, 100.0, (half, 3))
+    trs[:, 3, 3] = 1.0
+
+    general = rng.uniform(-1.0, 1.0, (n - half, 4, 4)) + 4.0 * np.eye(4)
+    return np.concatenate([trs, general])
+
+
+def _mat4_mul(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    ins = _f32(rng.uniform(-10.0, 10.0, (n, 32)))
+    a = _from_col_major(ins[:, :16])
+    b = _from_col_major(ins[:, 16:])
+    return ins, _col_major(a @ b)
+
+
+def _mat4_inverse(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    ins = _f32(_col_major(_random_invertible_mat4(rng, n)))
+    return ins, _col_major(np.linalg.inv(_from_col_major(ins)))
+
+
+def _quat_slerp(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    ins = _f32(np.concatenate([_unit_quats(rng, n), _unit_quats(rng, n), rng.uniform(0.0, 1.0, (n, 1))], axis=1))
+    a, b, t = ins[:, 0:4], ins[:, 4:8].copy(), ins[:, 8:9]
+
+    # Shortest arc, same sign convention as javelin::slerp.
+    d = np.sum(a * b, axis=1, keepdims=True)
+    b[d[:, 0] < 0.0] *= -1.0
+    d = np.abs(d)
+
+    theta = np.arccos(np.clip(d, -1.0, 1.0))
+    s = np.sin(theta)
+    near = s < 1e-12
+    s = np.where(near, 1.0, s)
+    w0 = np.where(near, 1.0 - t, np.sin((1.0 - t) * theta) / s)
+    w1 = np.where(near, t, np.sin(t * theta) / s)
+
+    out = a * w0 + b * w1
+    return ins, out / np.linalg.norm(out, axis=1, keepdims=True)
+
+
+def _quat_rotate(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    ins = _f32(np.concatenate([_unit_quats(rng, n), rng.uniform(-10.0, 10.0, (n, 3))], axis=1))
+    q = ins[:, 0:4] / np.linalg.norm(ins[:, 0:4], axis=1, keepdims=True)
+    u, w, v = q[:, 0:3], q[:, 3:4], ins[:, 4:7]
+    t = 2.0 * np.cross(u, v)
+    return ins, v + w * t + np.cross(u, t)
+
+
+def _vec3_normalize(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    dirs = rng.standard_normal((n, 3))
+    dirs /= np.linalg.norm(dirs, axis=1, keepdims=True)
+    ins = _f32(dirs * 10.0 ** rng.uniform(-3.0, 3.0, (n, 1)))
+    return ins, ins / np.linalg.norm(ins, axis=1, keepdims=True)
+
+
+def _vec3_cross(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    ins = _f32(rng.uniform(-10.0, 10.0, (n, 6)))
+    return ins, np.cross(ins[:, 0:3], ins[:, 3:6])
+
+
+_OPS: tuple[Op, ...] = (
+    Op("mat4_mul", 32, 16, _mat4_mul),
+    Op("mat4_inverse", 16, 16, _mat4_inverse),
+    Op("quat_slerp", 9, 4, _quat_slerp),
+    Op("quat_rotate", 7, 3, _quat_rotate),
+    Op("vec3_normalize", 3, 3, _vec3_normalize),
+    Op("vec3_cross", 6, 3, _vec3_cross),
+)
+
+
+def _write_op(path: Path, op: Op, ins: np.ndarray, outs: np.ndarray) -> None:
+    if ins.shape[1] != op.in_floats or outs.shape[1] != op.out_floats:
+        raise RuntimeError(f"{op.name}: generated shapes {ins.shape}/{outs.shape} do not match the op layout")
+    with path.open("wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(ins), op.in_floats, op.out_floats))
+        f.write(np.ascontiguousarray(ins, dtype="<f4").tobytes())
+        f.write(np.ascontiguousarray(outs, dtype="<f4").tobytes())
+
+
+def main(argv: Sequence[str]) -> int:
+    ap = argparse.ArgumentParser(description="Generate NumPy reference vectors for the javelin.math benchmark.")
+    ap.add_argument("--out-dir", type=Path, default=Path("build/math_reference"), help="Output directory.")
+    ap.add_argument("--count", type=int, default=1 << 20, help="Cases per operation (default: 1048576).")
+    ap.add_argument("--seed", type=int, default=1, help="RNG seed.")
+    ap.add_argument(
+        "--op",
+        action="append",
+        choices=[op.name for op in _OPS],
+        default=[],
+        help="Only generate this operation (repeatable). Default: all.",
+    )
+    args = ap.parse_args(list(argv))
+
+    if args.count <= 0:
+        raise RuntimeError("--count must be positive")
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    for i, op in enumerate(_OPS):
+        if args.op and op.name not in args.op:
+            continue
+        # Per-op streams so filtering ops never changes another op's cases.
+        rng = np.random.default_rng([args.seed, i])
+        ins, outs = op.make(rng, args.count)
+        path = args.out_dir / f"{op.name}.bin"
+        _write_op(path, op, ins, outs)
+        print(f"Wrote: {path} ({args.count} cases)")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main(sys.argv[1:]))
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        raise SystemExit(1)
@@ -2,15 +2,18 @@
 from __future__ import annotations
 
 import argparse
+import array
 import dataclasses
+import heapq
 import os
+import platform
 import re
 import subprocess
 import sys
 import time
 from collections import defaultdict
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence
+from typing import Iterable, Iterator, Mapping, Sequence
 
 
 @dataclasses.dataclass(frozen=True)
@@ -106,58 +109,93 @@ def _cmake_build(*, build_dir: Path, cmake: str, jobs: int) -> float:
     return time.perf_counter() - t0
 
 
-def _read_ninja_log(path: Path) -> list[NinjaLogEntry]:
+@dataclasses.dataclass
+class NinjaLog:
+    """Column-oriented .ninja_log contents; one row per logged build step."""
+
+    start_ms: array.array[int] = dataclasses.field(default_factory=lambda: array.array("q"))
+    end_ms: array.array[int] = dataclasses.field(default_factory=lambda: array.array("q"))
+    outputs: list[str] = dataclasses.field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.outputs)
+
+    def dur_ms(self, i: int) -> int:
+        return max(0, self.end_ms[i] - self.start_ms[i])
+
+    def entry(self, i: int) -> NinjaLogEntry:
+        return NinjaLogEntry(start_ms=self.start_ms[i], end_ms=self.end_ms[i], output=self.outputs[i])
+
+    def __iter__(self) -> Iterator[NinjaLogEntry]:
+        return (self.entry(i) for i in range(len(self)))
+
+    def top(self, n: int) -> list[NinjaLogEntry]:
+        durs = [max(0, e - s) for s, e in zip(self.start_ms, self.end_ms)]
+        return [self.entry(i) for i in heapq.nlargest(n, range(len(durs)), key=durs.__getitem__)]
+
+
+def _read_ninja_log(path: Path) -> NinjaLog:
     if not path.is_file():
         raise RuntimeError(
             f"{path} not found. This script requires the Ninja generator."
         )
 
-    entries: list[NinjaLogEntry] = []
+    log = NinjaLog()
+    start_ms = log.start_ms.append
+    end_ms = log.end_ms.append
+    outputs = log.outputs.append
 
     with path.open("r", encoding="utf-8", errors="replace") as f:
         for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
+            if line.startswith("#"):
                 continue
-            parts = line.split("\t")
+            # Format: start\tend\trestat\toutput\tcommandhash
+            parts = line.split("\t", 4)
             if len(parts) < 4:
                 continue
-            # Format: start\tend\trestat\toutput\tcommandhash
             try:
-                start_ms = int(parts[0])
-                end_ms = int(parts[1])
+                start = int(parts[0])
+                end = int(parts[1])
             except ValueError:
                 continue
-            output = parts[3]
-            entries.append(NinjaLogEntry(start_ms=start_ms, end_ms=end_ms, output=output))
+            start_ms(start)
+            end_ms(end)
+            outputs(parts[3].strip())
 
-    if not entries:
+    if not log.outputs:
         raise RuntimeError(f"{path} contained no entries (did the build do any work?).")
-    return entries
+    return log
 
 
-def _wall_time_from_log(entries: Sequence[NinjaLogEntry]) -> float:
-    min_start = min(e.start_ms for e in entries)
-    max_end = max(e.end_ms for e in entries)
+def _wall_time_from_log(log: NinjaLog) -> float:
+    min_start = min(log.start_ms)
+    max_end = max(log.end_ms)
     return max(0.0, (max_end - min_start) / 1000.0)
 
 
 def _ext_of_output(output: str) -> str:
-    p = Path(output)
-    ext = p.suffix.lower()
-    return ext if ext else "<none>"
-
-
-def _summarize_by_ext(entries: Sequence[NinjaLogEntry]) -> list[tuple[str, int, float, float]]:
-    buckets: dict[str, list[int]] = defaultdict(list)
-    for e in entries:
-        buckets[_ext_of_output(e.output)].append(e.dur_ms)
+    # Same result as Path(output).suffix.lower() for ninja outputs (including a trailing "/"),
+    # without building a Path per step.
+    name = output.rstrip("/").rpartition("/")[2]
+    dot = name.rfind(".")
+    if dot <= 0 or dot == len(name) - 1:
+        return "<none>"
+    return name[dot:].lower()
+
+
+def _summarize_by_ext(log: NinjaLog) -> list[tuple[str, int, float, float]]:
+    counts: dict[str, int] = defaultdict(int)
+    totals_ms: dict[str, int] = defaultdict(int)
+    for output, start, end in zip(log.outputs, log.start_ms, log.end_ms):
+        ext = _ext_of_output(output)
+        counts[ext] += 1
+        totals_ms[ext] += max(0, end - start)
 
     rows: list[tuple[str, int, float, float]] = []
-    for ext, durs in buckets.items():
-        total_s = sum(durs) / 1000.0
-        avg_s = (total_s / len(durs)) if durs else 0.0
-        rows.append((ext, len(durs), total_s, avg_s))
+    for ext, count in counts.items():
+        total_s = totals_ms[ext] / 1000.0
+        avg_s = (total_s / count) if count else 0.0
+        rows.append((ext, count, total_s, avg_s))
 
     rows.sort(key=lambda r: r[2], reverse=True)  # by total_s desc
     return rows
@@ -219,35 +257,216 @@ def _print_table(rows: Sequence[Sequence[str]]) -> None:
         print(line)
 
 
-def _write_trace_json(entries: Sequence[NinjaLogEntry], out_path: Path) -> None:
+def _write_trace_json(log: NinjaLog, out_path: Path) -> None:
     # Chrome/Perfetto "traceEvents" format with complete events.
     # All events are on a single thread; it’s still useful for “what was slow”.
-    events: list[dict[str, object]] = [
-        {"ph": "M", "pid": 1, "tid": 1, "name": "process_name", "args": {"name": "ninja"}},
-        {"ph": "M", "pid": 1, "tid": 1, "name": "thread_name", "args": {"name": "build"}},
-    ]
+    # Events are streamed in chunks rather than built as one object; a ".gz" suffix gzips the output.
+    import gzip  # local imports to keep module load minimal
+    import json
 
-    for e in entries:
-        events.append(
-            {
-                "name": e.output,
-                "cat": "ninja",
-                "ph": "X",
-                "ts": e.start_ms * 1000,  # us
-                "dur": e.dur_ms * 1000,   # us
-                "pid": 1,
-                "tid": 1,
-            }
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if out_path.suffix == ".gz":
+        stream = gzip.open(out_path, "wt", encoding="utf-8", compresslevel=6)
+    else:
+        stream = out_path.open("w", encoding="utf-8")
+
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    chunk: list[str] = []
+    with stream as f:
+        f.write(
+            '{"traceEvents": ['
+            '{"ph": "M", "pid": 1, "tid": 1, "name": "process_name", "args": {"name": "ninja"}}, '
+            '{"ph": "M", "pid": 1, "tid": 1, "name": "thread_name", "args": {"name": "build"}}'
         )
+        for output, start, end in zip(log.outputs, log.start_ms, log.end_ms):
+            chunk.append(
+                f', {{"name": {encode(output)}, "cat": "ninja", "ph": "X", '
+                f'"ts": {start * 1000}, "dur": {max(0, end - start) * 1000}, "pid": 1, "tid": 1}}'
+            )
+            if len(chunk) >= 4096:
+                f.write("".join(chunk))
+                chunk.clear()
+        f.write("".join(chunk))
+        f.write("]}")
+
+
+_REPORT_VERSION = 1
+
+
+def _capture(cmd: Sequence[str], *, cwd: Path | None = None) -> str | None:
+    # Best-effort probe for report metadata; never fails the run.
+    try:
+        proc = subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip() or None
+
+
+def _git_revision(project_root: Path) -> dict[str, object]:
+    rev = _capture(["git", "rev-parse", "HEAD"], cwd=project_root)
+    status = _capture(["git", "status", "--porcelain", "--untracked-files=no"], cwd=project_root)
+    return {"revision": rev, "dirty": bool(status)}
+
+
+def _first_line(text: str | None) -> str | None:
+    return text.splitlines()[0] if text else None
+
+
+def _step_durations(log: NinjaLog) -> dict[str, int]:
+    # Later lines win: an accumulated .ninja_log records re-runs of an output after older ones.
+    return {output: max(0, end - start) for output, start, end in zip(log.outputs, log.start_ms, log.end_ms)}
+
+
+def _write_json(payload: Mapping[str, object], out_path: Path) -> None:
+    import json  # local import to keep module load minimal
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def _load_step_durations(path: Path) -> dict[str, int]:
+    """Per-output durations (ms) from a --json report or a raw .ninja_log."""
+    if not path.is_file():
+        raise RuntimeError(f"{path} not found.")
+
+    with path.open("rb") as f:
+        head = f.read(1)
+    if head != b"{":
+        return _step_durations(_read_ninja_log(path))
+
     import json  # local import to keep module load minimal
 
-    out_path.write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
+    try:
+        report = json.loads(path.read_text(encoding="utf-8"))
+        return {str(step["output"]): int(step["dur_ms"]) for step in report["steps"]}
+    except (ValueError, KeyError, TypeError) as e:
+        raise RuntimeError(f"{path} is not a profile_build --json report: {e}") from e
+
+
+@dataclasses.dataclass(frozen=True)
+class StepDelta:
+    output: str
+    before_ms: int | None
+    after_ms: int | None
+
+    @property
+    def delta_ms(self) -> int:
+        return (self.after_ms or 0) - (self.before_ms or 0)
+
+    @property
+    def kind(self) -> str:
+        if self.before_ms is None:
+            return "added"
+        if self.after_ms is None:
+            return "removed"
+        return "slower" if self.delta_ms > 0 else "faster"
+
+
+def _diff_steps(before: Mapping[str, int], after: Mapping[str, int], *, min_delta_ms: int) -> list[StepDelta]:
+    deltas: list[StepDelta] = []
+    for output in before.keys() | after.keys():
+        d = StepDelta(output=output, before_ms=before.get(output), after_ms=after.get(output))
+        if d.kind in ("slower", "faster") and abs(d.delta_ms) <= min_delta_ms:
+            continue
+        deltas.append(d)
+    deltas.sort(key=lambda d: (abs(d.delta_ms), d.output), reverse=True)
+    return deltas
+
+
+def _fmt_ms(ms: int | None) -> str:
+    return "-" if ms is None else f"{ms / 1000.0:.3f}"
+
+
+def _fmt_delta(ms: int) -> str:
+    return f"{ms / 1000.0:+.3f}"
+
+
+def _print_markdown(rows: Sequence[Sequence[str]]) -> None:
+    print("| " + " | ".join(rows[0]) + " |")
+    print("|" + "|".join("---" for _ in rows[0]) + "|")
+    for r in rows[1:]:
+        print("| " + " | ".join(c.replace("|", "\\|") for c in r) + " |")
+
+
+def _diff_main(argv: Sequence[str]) -> int:
+    ap = argparse.ArgumentParser(
+        prog="profile_build.py diff",
+        description="Compare two --json reports or .ninja_log files step by step (matched by output).",
+    )
+    ap.add_argument("before", type=Path, help="Baseline report (.json) or .ninja_log.")
+    ap.add_argument("after", type=Path, help="Candidate report (.json) or .ninja_log.")
+    ap.add_argument("--top", type=int, default=20, help="Show top N steps by absolute delta.")
+    ap.add_argument(
+        "--min-delta-ms",
+        type=int,
+        default=0,
+        help="Ignore faster/slower steps whose change is at most this many ms (noise floor).",
+    )
+    ap.add_argument("--markdown", action="store_true", help="Emit Markdown tables (for PR comments).")
+    ap.add_argument("--json", type=Path, default=None, help="Also write the full diff as JSON here.")
+    args = ap.parse_args(list(argv))
+
+    before = _load_step_durations(args.before)
+    after = _load_step_durations(args.after)
+    deltas = _diff_steps(before, after, min_delta_ms=args.min_delta_ms)
+
+    before_total = sum(before.values())
+    after_total = sum(after.values())
+    summary: dict[str, dict[str, int]] = {
+        kind: {"count": 0, "delta_ms": 0} for kind in ("added", "removed", "slower", "faster")
+    }
+    for d in deltas:
+        summary[d.kind]["count"] += 1
+        summary[d.kind]["delta_ms"] += d.delta_ms
+
+    emit = _print_markdown if args.markdown else _print_table
+    heading = (lambda t: print(f"### {t}")) if args.markdown else (lambda t: print(f"=== {t} ==="))
+
+    heading("Compile-time impact")
+    table: list[list[str]] = [["", "steps", "total(s)"]]
+    table.append(["before", str(len(before)), _fmt_ms(before_total)])
+    table.append(["after", str(len(after)), _fmt_ms(after_total)])
+    table.append(["delta", f"{len(after) - len(before):+d}", _fmt_delta(after_total - before_total)])
+    emit(table)
+
+    print()
+    table = [["change", "steps", "delta(s)"]]
+    for kind, row in summary.items():
+        table.append([kind, str(row["count"]), _fmt_delta(row["delta_ms"])])
+    emit(table)
+
+    print()
+    heading(f"Top {args.top} steps by absolute delta")
+    rows: list[list[str]] = [["change", "delta(s)", "before(s)", "after(s)", "output"]]
+    for d in deltas[: args.top]:
+        rows.append([d.kind, _fmt_delta(d.delta_ms), _fmt_ms(d.before_ms), _fmt_ms(d.after_ms), d.output])
+    emit(rows)
+
+    if args.json is not None:
+        _write_json(
+            {
+                "version": _REPORT_VERSION,
+                "before": {"path": str(args.before), "steps": len(before), "total_ms": before_total},
+                "after": {"path": str(args.after), "steps": len(after), "total_ms": after_total},
+                "summary": summary,
+                "steps": [dataclasses.asdict(d) | {"kind": d.kind, "delta_ms": d.delta_ms} for d in deltas],
+            },
+            args.json,
+        )
+        print()
+        print(f"diff JSON written : {args.json}")
+
+    return 0
 
 
 def main(argv: Sequence[str]) -> int:
-    ap = argparse.ArgumentParser(description="Clean-build and profile compile times using Ninja logs.")
+    if argv and argv[0] == "diff":
+        return _diff_main(argv[1:])
+
+    ap = argparse.ArgumentParser(
+        description="Clean-build and profile compile times using Ninja logs. "
+        "Use 'profile_build.py diff BEFORE AFTER' to compare two runs."
+    )
     ap.add_argument(
         "--config",
         choices=sorted(_BUILD_CONFIGS.keys()),
@@ -274,10 +493,17 @@ def main(argv: Sequence[str]) -> int:
         "--trace-out",
         type=Path,
         default=None,
-        help="Write Perfetto/Chrome trace JSON here. Default: <build-dir>/ninja_trace.json",
+        help="Write Perfetto/Chrome trace JSON here (.json.gz to compress). Default: <build-dir>/ninja_trace.json",
     )
     ap.add_argument("--no-trace", action="store_true", help="Do not write trace JSON.")
     ap.add_argument("--no-query", action="store_true", help="Do not call 'ninja -t query' for top steps.")
+    ap.add_argument(
+        "--json",
+        nargs="?",
+        const="",
+        default=None,
+        help="Write the full report as JSON (for 'diff' and automation). Default path: <build-dir>/build_profile.json",
+    )
     args = ap.parse_args(list(argv))
 
     project_root = Path.cwd()
@@ -292,6 +518,7 @@ def main(argv: Sequence[str]) -> int:
     extra_cxx_flags = "-ftime-trace" if args.ftime_trace else None
 
     trace_out = args.trace_out or (build_dir / "ninja_trace.json")
+    json_out = None if args.json is None else (Path(args.json) if args.json else build_dir / "build_profile.json")
 
     print(f"== javelin build profile ==")
     print(f"config       : {cfg.name} ({cfg.cmake_build_type})")
@@ -331,8 +558,8 @@ def main(argv: Sequence[str]) -> int:
 
     build_s = _cmake_build(build_dir=build_dir, cmake=args.cmake, jobs=args.jobs)
 
-    entries = _read_ninja_log(ninja_log)
-    wall_s = _wall_time_from_log(entries)
+    log = _read_ninja_log(ninja_log)
+    wall_s = _wall_time_from_log(log)
 
     print()
     print("=== Timing ===")
@@ -340,11 +567,11 @@ def main(argv: Sequence[str]) -> int:
     print(f"clean wall time     : {clean_s:.3f} s")
     print(f"build wall time     : {build_s:.3f} s")
     print(f"ninja log wall time : {wall_s:.3f} s")
-    print(f"logged steps        : {len(entries)}")
+    print(f"logged steps        : {len(log)}")
 
     print()
     print("=== Time by output extension (sorted by total time) ===")
-    ext_rows = _summarize_by_ext(entries)
+    ext_rows = _summarize_by_ext(log)
     table: list[list[str]] = [["ext", "count", "total(s)", "avg(s)"]]
     for ext, count, total_s, avg_s in ext_rows[:15]:
         table.append([ext, str(count), f"{total_s:.3f}", f"{avg_s:.3f}"])
@@ -352,23 +579,62 @@ def main(argv: Sequence[str]) -> int:
 
     print()
     print(f"=== Top {args.top} slowest build steps ===")
-    top = sorted(entries, key=lambda e: e.dur_ms, reverse=True)[: args.top]
+    top = log.top(args.top)
 
     rows: list[list[str]] = [["time(s)", "output", "input (best-effort)"]]
+    top_inputs: list[str | None] = []
     for e in top:
-        inp = ""
+        inp = None
         if not args.no_query:
-            maybe = _ninja_query_input(ninja=args.ninja, build_dir=build_dir, output=e.output)
-            inp = maybe or ""
-        rows.append([f"{e.dur_ms / 1000.0:.3f}", e.output, inp])
+            inp = _ninja_query_input(ninja=args.ninja, build_dir=build_dir, output=e.output)
+        top_inputs.append(inp)
+        rows.append([f"{e.dur_ms / 1000.0:.3f}", e.output, inp or ""])
     _print_table(rows)
 
     if not args.no_trace:
-        _write_trace_json(entries, trace_out)
+        _write_trace_json(log, trace_out)
         print()
         print(f"trace JSON written : {trace_out}")
         print("open with          : https://ui.perfetto.dev  (or chrome://tracing)")
 
+    if json_out is not None:
+        report: dict[str, object] = {
+            "version": _REPORT_VERSION,
+            "environment": {
+                "config": cfg.name,
+                "cmake_build_type": cfg.cmake_build_type,
+                "generator": args.generator,
+                "cc": args.cc,
+                "cxx": args.cxx,
+                "cxx_version": _first_line(_capture([args.cxx, "--version"])),
+                "cmake_version": _first_line(_capture([args.cmake, "--version"])),
+                "jobs": args.jobs,
+                "examples": build_examples,
+                "tracy": enable_tracy,
+                "ftime_trace": args.ftime_trace,
+                "git": _git_revision(project_root),
+                "host": platform.node(),
+                "platform": platform.platform(),
+            },
+            "timings_s": {
+                "configure": configure_s,
+                "clean": clean_s,
+                "build": build_s,
+                "ninja_log_wall": wall_s,
+            },
+            "by_extension": [
+                {"ext": ext, "count": count, "total_s": total_s, "avg_s": avg_s}
+                for ext, count, total_s, avg_s in ext_rows
+            ],
+            "top_steps": [
+                {"output": e.output, "dur_ms": e.dur_ms, "input": inp} for e, inp in zip(top, top_inputs)
+            ],
+            "steps": [{"output": output, "dur_ms": dur} for output, dur in _step_durations(log).items()],
+        }
+        _write_json(report, json_out)
+        print()
+        print(f"report JSON written: {json_out}")
+
     return 0
 
 